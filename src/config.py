@@ -219,6 +219,8 @@ EMA_MODE_SL_MARGIN = 9.0            # SL: Margin $10 → $9 olunca kapat (-$1 za
 WEBSOCKET_KLINE_INTERVAL = "15m"    # 15 dakikalık mumlar (real-time monitoring)
 WEBSOCKET_ENABLED = os.getenv("WEBSOCKET_ENABLED", "True").lower() == "true"  # WebSocket aktif/pasif
 WEBSOCKET_STRICT_CROSSOVER = os.getenv("WEBSOCKET_STRICT_CROSSOVER", "True").lower() == "true"  # Sadece SON MUMDA crossover kabul
+EXECUTOR_USER_STREAM_ENABLED = os.getenv("EXECUTOR_USER_STREAM_ENABLED", "False").lower() == "true"  # Emir dolumlarını user-data WebSocket'ten izle (kapalıysa sleep + REST); sadece open_market_order kullanır (rsi_hunter)
+EXECUTOR_MARK_PRICE_STREAM_ENABLED = os.getenv("EXECUTOR_MARK_PRICE_STREAM_ENABLED", "True").lower() == "true"  # Mark price'ları WebSocket'ten oku (ilk get_mark_price'ta açılır; kapalıysa REST)
 
 # 🎯 CROSSOVER DETECTION LOGIC:
 # True (STRICT):  Sadece son mumda EMA5 x EMA20 kesişimi → Taze sinyaller
@@ -335,6 +337,8 @@ PROFIT_TARGET_PERCENT = float(os.getenv("PROFIT_TARGET_PERCENT", 40.0))  # Kâr
 # v11.1 LIVE MODE: Otomatik kapanma AKTİF (maksimum zararda bot durur)
 AUTO_CLOSE_ON_CIRCUIT_BREAKER = os.getenv("AUTO_CLOSE_ON_CIRCUIT_BREAKER", "True").lower() == "true"  # ✅ GÜVENLİK
 AUTO_TRANSFER_PROFIT = os.getenv("AUTO_TRANSFER_PROFIT", "False").lower() == "true"  # Otomatik kâr transferi
+CAPITAL_CACHE_TTL_SECONDS = float(os.getenv("CAPITAL_CACHE_TTL_SECONDS", 15.0))  # Bakiye/pozisyon okuma cache süresi (sn)
+ALERT_MIN_INTERVAL_S = float(os.getenv("ALERT_MIN_INTERVAL_S", 900.0))  # Aynı sermaye alarmı en fazla bu aralıkla tekrar gönderilir (sn)
 # 🆕 v9.3 PORTFÖY GÜVENLİĞİ: Günlük risk bütçesi ve devre kesici
 MAX_DAILY_RISK_PERCENT = float(os.getenv("MAX_DAILY_RISK_PERCENT", 5.0))  # Günlük toplam yeni risk bütçesi (% portföy)
 MAX_DAILY_DRAWDOWN_PERCENT = float(os.getenv("MAX_DAILY_DRAWDOWN_PERCENT", 5.0))  # Günlük max DD (yeni pozisyonları durdur)
@@ -1667,6 +1667,17 @@ def graceful_shutdown(signum, frame):
         scanner_thread.join(timeout=5)
         logger.info("   ✅ Scanner durduruldu")
     
+    # Executor'ın user-data / mark-price stream'lerini kapat
+    try:
+        from src.trade_manager.executor import get_executor
+        executor = get_executor()
+        if executor:
+            logger.info("📡 Executor stream'leri kapatılıyor...")
+            executor.stop_streams()
+            logger.info("   ✅ Executor stream'leri kapatıldı")
+    except Exception as e:
+        logger.warning(f"   ⚠️ Executor stream'leri kapatılırken hata: {e}")
+    
     # 📰 v11.7: News Analyzer'ı durdur
     global news_analyzer_instance
     if news_analyzer_instance:
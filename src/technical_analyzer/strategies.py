@@ -16,6 +16,7 @@ Eski strateji referansı için: archive/strategies_v5.0_backup.py
 """
 
 import logging
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -23,27 +24,25 @@ logger = logging.getLogger(__name__)
 logger.info("⚠️  strategies.py yüklendi (v10.6'da kullanılmıyor - legacy reference only)")
 
 # Eğer hala eski sistem çağrılarıyla uyumluluk gerekiyorsa:
-def determine_regime(*args, **kwargs):
-    """DEPRECATED - v10.6 sistemde kullanılmıyor"""
-    logger.warning("⚠️  determine_regime() çağrıldı ama v10.6'da bu fonksiyon kullanılmıyor!")
-    return "STOP"
-
-def find_pullback_signal(*args, **kwargs):
-    """DEPRECATED - v10.6 sistemde kullanılmıyor"""
-    logger.warning("⚠️  find_pullback_signal() çağrıldı ama v10.6'da bu fonksiyon kullanılmıyor!")
-    return None
-
-def find_mean_reversion_signal(*args, **kwargs):
-    """DEPRECATED - v10.6 sistemde kullanılmıyor"""
-    logger.warning("⚠️  find_mean_reversion_signal() çağrıldı ama v10.6'da bu fonksiyon kullanılmıyor!")
-    return None
-
-def find_breakout_signal(*args, **kwargs):
-    """DEPRECATED - v10.6 sistemde kullanılmıyor"""
-    logger.warning("⚠️  find_breakout_signal() çağrıldı ama v10.6'da bu fonksiyon kullanılmıyor!")
-    return None
-
-def find_advanced_scalp_signal(*args, **kwargs):
-    """DEPRECATED - v10.6 sistemde kullanılmıyor"""
-    logger.warning("⚠️  find_advanced_scalp_signal() çağrıldı ama v10.6'da bu fonksiyon kullanılmıyor!")
-    return None
+@lru_cache(maxsize=None)
+def _warn_once(name: str):
+    """Her eski fonksiyon için uyarıyı process başına yalnızca bir kez basar."""
+    logger.warning("⚠️  %s() çağrıldı ama v10.6'da bu fonksiyon kullanılmıyor!", name)
+
+
+def _deprecated_stub(name: str, result=None):
+    """Uyarı verip sabit değer döndüren DEPRECATED fonksiyon üretir."""
+    def stub(*args, **kwargs):
+        _warn_once(name)
+        return result
+
+    stub.__name__ = stub.__qualname__ = name
+    stub.__doc__ = "DEPRECATED - v10.6 sistemde kullanılmıyor"
+    return stub
+
+
+determine_regime = _deprecated_stub("determine_regime", "STOP")
+find_pullback_signal = _deprecated_stub("find_pullback_signal")
+find_mean_reversion_signal = _deprecated_stub("find_mean_reversion_signal")
+find_breakout_signal = _deprecated_stub("find_breakout_signal")
+find_advanced_scalp_signal = _deprecated_stub("find_advanced_scalp_signal")
@@ -6,55 +6,241 @@ Sermaye Yönetimi Modülü
 - Kâr Realizasyonu: Belirli kâr hedeflerine ulaşıldığında kârı Spot'a transfer eder
 """
 
+import atexit
 import logging
-from typing import Optional
-from threading import Event
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from threading import Event, Lock, RLock, Thread
+
+from src.notifications import telegram as telegram_notifier
+from src.notifications.telegram import escape_markdown_v2
 
 logger = logging.getLogger(__name__)
 
+# Log banner'ları (sabit)
+_BANNER_SEP = "=" * 60
+_BANNER_CRIT = "🚨" * 20
+_BANNER_TGT = "🎯" * 20
+
+# Acil kapatmada aynı anda gönderilecek maksimum emir sayısı
+_MAX_CLOSE_WORKERS = 10
+
+# Bakiye bu kadar değişmediyse ve eşiklere uzaksa kontrol atlanır
+_BALANCE_EPSILON_USD = 0.01
+_THRESHOLD_BAND_PERCENT = 5.0  # PnL eşiğe bu kadar (yüzde puan) yakınsa kontrol asla atlanmaz
+
+# Gönderilmeyi bekleyen Telegram alarmı üst sınırı (dolarsa yeni alarm düşürülür)
+_ALERT_QUEUE_SIZE = 16
+_ALERT_FLUSH_TIMEOUT_SECONDS = 10.0  # Kapanışta kuyruktaki alarmlar için en fazla bekleme
+
+# Telegram alarm şablonları (MarkdownV2). Sabit parçalar burada bir kez escape edilir;
+# {placeholder} alanlarına çağıran taraf escape'li değerleri verir.
+_D = escape_markdown_v2('-')
+_GT = escape_markdown_v2('>')
+_N1, _N2, _N3 = (escape_markdown_v2(f'{i}.') for i in range(1, 4))
+
+_BREAKER_HEAD = "\n".join([
+    "*🚨 KRİTİK RİSK UYARISI 🚨*",
+    "",
+    "*DEVRE KESİCİ AKTİF\\!*",
+    "",
+    f"*{_D} Toplam Zarar:* {{pnl_pct}}",
+    f"*{_D} Limit:* {{limit}}",
+    f"*{_D} Mevcut Bakiye:* {{balance}}",
+    f"*{_D} Açık Pozisyon:* {{n_positions}}",
+    "",
+    "*⛔ SİSTEM DURDURULDU\\!*",
+    "",
+])
+_PROFIT_HEAD = "\n".join([
+    "*🎯 KÂR HEDEFİNE ULAŞILDI 🎯*",
+    "",
+    f"*{_D} Kâr:* {{pnl}} \\({{pnl_pct}}\\)",
+    f"*{_D} Hedef:* {{target}}",
+    f"*{_D} Mevcut Bakiye:* {{balance}}",
+    "",
+])
+
+_ALERT_TEMPLATES = {
+    "breaker_auto": _BREAKER_HEAD + "\n" + "*⚠️ Tüm pozisyonlar otomatik kapatılıyor\\!*",
+    "breaker_manual": _BREAKER_HEAD + "\n" + "\n".join([
+        "*ℹ️ Lütfen pozisyonları MANUEL kontrol edin\\!*",
+        "",
+        "*Öneriler:*",
+        f"{_N1} Binance'e giriş yapın",
+        f"{_N2} Açık pozisyonları inceleyin",
+        f"{_N3} Zarar durdur ayarlarını kontrol edin",
+    ]),
+    "profit_auto": _PROFIT_HEAD + "\n" + "*💸 Kâr otomatik olarak Spot cüzdana aktarılıyor\\!*",
+    "profit_manual": _PROFIT_HEAD + "\n" + "\n".join([
+        "*ℹ️ Kârı manuel çekmek için:*",
+        f"{_N1} Binance {_GT} Wallet",
+        f"{_N2} Transfer {_GT} Futures to Spot",
+        f"{_N3} Miktar: {{pnl}}",
+    ]),
+}
+
+
+def _as_bool(value) -> bool:
+    """Config/env değerini bool'a çevirir ("false" gibi string'ler True sayılmaz)."""
+    return str(value).strip().lower() in {"1", "true", "yes"}
+
+
+@dataclass(frozen=True, slots=True)
+class CapitalConfig:
+    """
+    CapitalManager ayarlarının tipli, değişmez anlık görüntüsü.
+    Config modülünden bir kez okunur; tip hataları başlangıçta yakalanır.
+    """
+    starting_capital: float = 200.0
+    max_drawdown_percent: float = -50.0
+    profit_target_percent: float = 50.0
+    auto_close_on_breaker: bool = False
+    auto_transfer_profit: bool = False
+    cache_ttl_seconds: float = 15.0
+    alert_min_interval: float = 900.0
+    
+    @classmethod
+    def from_module(cls, config_module) -> "CapitalConfig":
+        """src.config modülünden (eksik alanlar için varsayılanlarla) oluşturur."""
+        return cls(
+            starting_capital=float(getattr(config_module, 'VIRTUAL_PORTFOLIO_USD', 200.0)),
+            max_drawdown_percent=float(getattr(config_module, 'MAX_DRAWDOWN_PERCENT', -50.0)),
+            profit_target_percent=float(getattr(config_module, 'PROFIT_TARGET_PERCENT', 50.0)),
+            auto_close_on_breaker=_as_bool(getattr(config_module, 'AUTO_CLOSE_ON_CIRCUIT_BREAKER', False)),
+            auto_transfer_profit=_as_bool(getattr(config_module, 'AUTO_TRANSFER_PROFIT', False)),
+            cache_ttl_seconds=float(getattr(config_module, 'CAPITAL_CACHE_TTL_SECONDS', 15.0)),
+            alert_min_interval=float(getattr(config_module, 'ALERT_MIN_INTERVAL_S', 900.0)),
+        )
+
 
 class CapitalManager:
     """
     Sermaye yönetimi ve risk kontrolü sınıfı.
     """
     
-    def __init__(self, config_module, executor, stop_event: Event):
+    def __init__(self, config_module, executor, stop_event: Event,
+                 settings: Optional[CapitalConfig] = None):
         """
         Args:
             config_module: src.config modülü
             executor: BinanceFuturesExecutor instance
             stop_event: Threading.Event (bot'u durdurmak için)
+            settings: Hazır CapitalConfig (verilmezse config_module'den okunur)
         """
         self.config = config_module
         self.executor = executor
         self.stop_event = stop_event
         
-        # Config'den ayarları al
-        self.starting_capital = float(getattr(config_module, 'VIRTUAL_PORTFOLIO_USD', 200.0))
-        self.max_drawdown_percent = float(getattr(config_module, 'MAX_DRAWDOWN_PERCENT', -50.0))
-        self.profit_target_percent = float(getattr(config_module, 'PROFIT_TARGET_PERCENT', 50.0))
-        self.auto_close_on_breaker = getattr(config_module, 'AUTO_CLOSE_ON_CIRCUIT_BREAKER', False)
-        self.auto_transfer_profit = getattr(config_module, 'AUTO_TRANSFER_PROFIT', False)
+        # Binance okuma cache'i: {key: (timestamp, value)}
+        # Aynı kontrol döngüsünde bakiye/pozisyonlar tek seferde çekilir
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+        self._cache_lock = RLock()
+        
+        # Son alarm zamanları (monotonic); aynı alarm kısa aralıkla tekrar gönderilmez
+        self._last_alert: Dict[str, float] = {"breaker": 0.0, "profit": 0.0}
+        
+        # Son tam kontrolün yapıldığı bakiye (değişmemişse kontrol atlanır)
+        self._last_balance: Optional[float] = None
+        
+        # Telegram gönderimi ayrı thread'de; check_capital Telegram gecikmesini beklemez.
+        # Thread ilk alarmda başlatılır (alarm göndermeyen instance thread açmaz)
+        self._alert_queue: "queue.Queue[str]" = queue.Queue(maxsize=_ALERT_QUEUE_SIZE)
+        self._alert_thread: Optional[Thread] = None
+        self._alert_thread_lock = Lock()
+        
+        self.reload_config(settings)
         
-        logger.info(f"💰 Capital Manager başlatıldı:")
-        logger.info(f"   Başlangıç Sermaye: ${self.starting_capital:.2f}")
-        logger.info(f"   Maks Zarar Limiti: {self.max_drawdown_percent}%")
-        logger.info(f"   Kâr Hedefi: {self.profit_target_percent}%")
-        logger.info(f"   Otomatik Kapatma: {self.auto_close_on_breaker}")
-        logger.info(f"   Otomatik Transfer: {self.auto_transfer_profit}")
+        logger.info(
+            "💰 Capital Manager başlatıldı:\n"
+            "   Başlangıç Sermaye: $%.2f\n"
+            "   Maks Zarar Limiti: %s\n"
+            "   Kâr Hedefi: %s\n"
+            "   Otomatik Kapatma: %s\n"
+            "   Otomatik Transfer: %s",
+            self.starting_capital, self._max_dd_str, self._profit_target_str,
+            self.auto_close_on_breaker, self.auto_transfer_profit,
+        )
+    
+    def reload_config(self, settings: Optional[CapitalConfig] = None):
+        """
+        Config değerlerini okur ve instance attribute'larına yazar.
+        Config sadece burada okunur; check_capital() her çağrıda config'e gitmez.
+        Çalışma sırasında ayar değişirse bu metod açıkça çağrılmalıdır.
+        """
+        if settings is None:
+            settings = CapitalConfig.from_module(self.config)
+        self.settings = settings
+        self.starting_capital = settings.starting_capital
+        self.max_drawdown_percent = settings.max_drawdown_percent
+        self.profit_target_percent = settings.profit_target_percent
+        self.auto_close_on_breaker = settings.auto_close_on_breaker
+        self.auto_transfer_profit = settings.auto_transfer_profit
+        self.cache_ttl_seconds = settings.cache_ttl_seconds
+        self.alert_min_interval = settings.alert_min_interval
+        
+        # Config'e bağlı hazır metinler (log + escape'li Telegram parçaları)
+        self._max_dd_str = f"{self.max_drawdown_percent}%"
+        self._profit_target_str = f"{self.profit_target_percent}%"
+        self._esc_max_drawdown = escape_markdown_v2(self._max_dd_str)
+        self._esc_profit_target = escape_markdown_v2(self._profit_target_str)
+    
+    def _cached(self, key: str, ttl: float, fetch: Callable[[], Any],
+                is_valid: Optional[Callable[[Any], bool]] = None) -> Any:
+        """
+        TTL'li okuma cache'i. Süresi dolmamış değer varsa Binance'e gitmeden döndürür.
+        Kilit sadece cache erişiminde tutulur; farklı key'ler paralel çekilebilir.
+        is_valid False dönerse (başarısız okuma) değer cache'lenmez, sonraki çağrı tekrar dener.
+        """
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None and time.time() - entry[0] < ttl:
+                return entry[1]
+        
+        value = fetch()
+        if is_valid is not None and not is_valid(value):
+            return value
+        with self._cache_lock:
+            self._cache[key] = (time.time(), value)
+        return value
+    
+    def _invalidate_cache(self):
+        """Cache'lenmiş Binance okumalarını temizler (emir sonrası)."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def _get_balance(self) -> Optional[float]:
+        """Futures bakiyesi (cache'li; executor hata durumunda 0.0 döndüğü için None/0 cache'lenmez)."""
+        return self._cached("balance", self.cache_ttl_seconds, self.executor.get_futures_account_balance, bool)
+    
+    def _get_open_positions(self) -> List[Dict]:
+        """Binance açık pozisyonları (cache'li)."""
+        return self._cached("positions", self.cache_ttl_seconds, self.executor.get_open_positions_from_binance)
+    
+    def _fetch_balance_and_positions(self) -> Tuple[Optional[float], List[Dict]]:
+        """
+        Bakiye ve açık pozisyonları paralel çeker (2 REST çağrısı, tek RTT süresi).
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="CapitalFetch") as pool:
+            balance_future = pool.submit(self._get_balance)
+            positions_future = pool.submit(self._get_open_positions)
+            return balance_future.result(), positions_future.result()
     
     def check_capital(self):
         """
         Ana sermaye kontrolü fonksiyonu.
         Saatte bir çağrılır (schedule.every(1).hour.do()).
         """
-        logger.info("=" * 60)
-        logger.info("📊 SERMAYE KONTROLÜ BAŞLADI")
-        logger.info("=" * 60)
+        if self.stop_event.is_set():
+            logger.debug("stop_event set, sermaye kontrolü atlanıyor")
+            return
         
         try:
-            # 1. Mevcut bakiyeyi al
-            current_balance = self.executor.get_futures_account_balance()
+            # 1. Mevcut bakiye + açık pozisyonları al (paralel)
+            current_balance, open_positions = self._fetch_balance_and_positions()
             
             if current_balance is None or current_balance == 0:
                 logger.warning("⚠️ Futures bakiyesi 0 veya alınamadı. Kontrol atlanıyor.")
@@ -64,50 +250,75 @@ class CapitalManager:
             pnl = current_balance - self.starting_capital
             pnl_percent = (pnl / self.starting_capital) * 100 if self.starting_capital > 0 else 0
             
-            logger.info(f"💵 Mevcut Bakiye: ${current_balance:.2f}")
-            logger.info(f"💵 Başlangıç Sermaye: ${self.starting_capital:.2f}")
-            logger.info(f"📈 PnL: ${pnl:.2f} ({pnl_percent:+.2f}%)")
+            # Bakiye son kontrolden beri değişmediyse ve eşiklere uzaksa rapor tekrarlanmaz
+            if (self._last_balance is not None
+                    and abs(current_balance - self._last_balance) < _BALANCE_EPSILON_USD
+                    and not self._near_threshold(pnl_percent)):
+                logger.debug("Bakiye değişmedi ($%.2f), sermaye kontrolü atlanıyor", current_balance)
+                return
+            self._last_balance = current_balance
+            
+            logger.info(_BANNER_SEP)
+            logger.info("📊 SERMAYE KONTROLÜ BAŞLADI")
+            logger.info(_BANNER_SEP)
+            
+            logger.info("💵 Mevcut Bakiye: $%.2f", current_balance)
+            logger.info("💵 Başlangıç Sermaye: $%.2f", self.starting_capital)
+            logger.info("📈 PnL: $%.2f (%+.2f%%)", pnl, pnl_percent)
             
             # 3. Risk Kontrolü (Devre Kesici)
-            self._check_circuit_breaker(current_balance, pnl_percent)
+            breaker_tripped = self._check_circuit_breaker(current_balance, pnl_percent, open_positions)
             
-            # 4. Kâr Kontrolü (Kâr Realizasyonu)
-            self._check_profit_target(current_balance, pnl, pnl_percent)
+            # 4. Kâr Kontrolü (Kâr Realizasyonu) - devre kesici tetiklendiyse anlamsız
+            if not breaker_tripped:
+                self._check_profit_target(current_balance, pnl, pnl_percent)
             
-            logger.info("=" * 60)
+            logger.info(_BANNER_SEP)
             logger.info("✅ SERMAYE KONTROLÜ TAMAMLANDI")
-            logger.info("=" * 60)
+            logger.info(_BANNER_SEP)
             
         except Exception as e:
             logger.error(f"❌ Sermaye kontrolü sırasında hata: {e}", exc_info=True)
     
-    def _check_circuit_breaker(self, current_balance: float, pnl_percent: float):
+    def _near_threshold(self, pnl_percent: float) -> bool:
+        """PnL devre kesici veya kâr hedefine _THRESHOLD_BAND_PERCENT kadar yakın mı?"""
+        return (pnl_percent - self.max_drawdown_percent <= _THRESHOLD_BAND_PERCENT
+                or self.profit_target_percent - pnl_percent <= _THRESHOLD_BAND_PERCENT)
+    
+    def _check_circuit_breaker(self, current_balance: float, pnl_percent: float, open_positions: List[Dict]) -> bool:
         """
         Devre kesici kontrolü.
         Maksimum zarar limitini aşarsa sistemi durdurur.
+        
+        Returns:
+            bool: Devre kesici tetiklendiyse True
         """
         if pnl_percent <= self.max_drawdown_percent:
             # KRİTİK DURUM!
-            logger.critical("🚨" * 20)
-            logger.critical(f"🚨 DEVRE KESİCİ AKTİF!")
-            logger.critical(f"🚨 Toplam Zarar: {pnl_percent:.2f}%")
-            logger.critical(f"🚨 Limit: {self.max_drawdown_percent}%")
-            logger.critical(f"🚨 Mevcut Bakiye: ${current_balance:.2f}")
-            logger.critical("🚨" * 20)
-            
-            # Telegram bildirimi gönder
-            self._send_circuit_breaker_alert(current_balance, pnl_percent)
+            logger.critical(_BANNER_CRIT)
+            logger.critical("🚨 DEVRE KESİCİ AKTİF!")
+            logger.critical("🚨 Toplam Zarar: %.2f%%", pnl_percent)
+            logger.critical("🚨 Limit: %s", self._max_dd_str)
+            logger.critical("🚨 Mevcut Bakiye: $%.2f", current_balance)
+            logger.critical(_BANNER_CRIT)
             
-            # Sistemi durdur
+            # Önce sistemi durdur; Telegram gecikmesi durdurma sinyalini geciktirmemeli
             logger.critical("⛔ SİSTEM DURDURULUYOR...")
             self.stop_event.set()
             
+            # Telegram bildirimi kuyruğa (mesaj için sadece pozisyon sayısı gerekli)
+            self._send_circuit_breaker_alert(current_balance, pnl_percent, len(open_positions))
+            
             # Otomatik kapatma (TEHLİKELİ!)
             if self.auto_close_on_breaker:
                 logger.critical("⚠️ OTOMATİK KAPATMA AKTİF - TÜM POZİSYONLAR KAPATILIYOR!")
-                self._emergency_close_all_positions()
+                self._emergency_close_all_positions(open_positions)
             else:
                 logger.critical("ℹ️ Otomatik kapatma kapalı. Lütfen pozisyonları MANUEL kontrol edin!")
+            
+            return True
+        
+        return False
     
     def _check_profit_target(self, current_balance: float, pnl: float, pnl_percent: float):
         """
@@ -115,11 +326,11 @@ class CapitalManager:
         Belirli kâr yüzdesine ulaşıldığında kârı Spot'a transfer eder.
         """
         if pnl_percent >= self.profit_target_percent:
-            logger.info("🎯" * 20)
-            logger.info(f"🎯 KÂR HEDEFİNE ULAŞILDI!")
-            logger.info(f"🎯 Kâr: ${pnl:.2f} ({pnl_percent:+.2f}%)")
-            logger.info(f"🎯 Hedef: {self.profit_target_percent}%")
-            logger.info("🎯" * 20)
+            logger.info(_BANNER_TGT)
+            logger.info("🎯 KÂR HEDEFİNE ULAŞILDI!")
+            logger.info("🎯 Kâr: $%.2f (%+.2f%%)", pnl, pnl_percent)
+            logger.info("🎯 Hedef: %s", self._profit_target_str)
+            logger.info(_BANNER_TGT)
             
             # Telegram bildirimi
             self._send_profit_target_alert(current_balance, pnl, pnl_percent)
@@ -131,64 +342,98 @@ class CapitalManager:
             else:
                 logger.info("ℹ️ Otomatik transfer kapalı. Kârı manuel çekmek için Binance'e gidin.")
     
-    def _send_circuit_breaker_alert(self, current_balance: float, pnl_percent: float):
-        """Devre kesici Telegram bildirimi."""
+    def _alert_due(self, kind: str) -> bool:
+        """Alarm tekrar gönderilebilir mi? (ALERT_MIN_INTERVAL_S rate limit)"""
+        now = time.monotonic()
+        last = self._last_alert[kind]
+        if last and now - last < self.alert_min_interval:
+            logger.info("ℹ️ %s alarmı %.0f sn önce gönderildi, tekrar gönderilmiyor", kind, now - last)
+            return False
+        return True
+    
+    def _alert_worker(self):
+        """Kuyruktaki Telegram mesajlarını sırayla gönderir (daemon thread)."""
+        while True:
+            message = self._alert_queue.get()
+            try:
+                telegram_notifier.send_message(message)
+                logger.info("✅ Telegram bildirimi gönderildi")
+            except Exception as e:
+                logger.error(f"❌ Telegram bildirimi gönderilemedi: {e}", exc_info=True)
+            finally:
+                self._alert_queue.task_done()
+    
+    def _ensure_alert_worker(self):
+        """Alarm thread'ini (gerekirse) başlatır; kapanışta kuyruk boşaltılsın diye atexit'e kaydeder."""
+        with self._alert_thread_lock:
+            if self._alert_thread is not None:
+                return
+            self._alert_thread = Thread(target=self._alert_worker, name="CapitalAlertWorker", daemon=True)
+            self._alert_thread.start()
+            # Daemon thread process çıkışında öldürülür; bekleyen devre kesici alarmı kaybolmasın
+            atexit.register(self.wait_alerts)
+    
+    def wait_alerts(self, timeout: float = _ALERT_FLUSH_TIMEOUT_SECONDS) -> bool:
+        """
+        Kuyruktaki alarmlar gönderilene kadar en fazla timeout saniye bekler (test/kapanış için).
+        
+        Returns:
+            bool: Kuyruk boşaldıysa True, süre dolduysa False
+        """
+        deadline = time.monotonic() + timeout
+        q = self._alert_queue
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning("⚠️ %d Telegram alarmı %.1f sn içinde gönderilemedi", q.unfinished_tasks, timeout)
+                    return False
+                q.all_tasks_done.wait(remaining)
+        return True
+    
+    def _send_alert(self, kind: str, template_key: str, **fields):
+        """
+        Şablondan Telegram mesajı oluşturur ve gönderim kuyruğuna ekler (alanlar escape'li olmalı).
+        Rate limit zamanı yalnızca mesaj kuyruğa girince yazılır; düşen alarm bir sonraki kontrolde tekrar denenir.
+        """
         try:
-            from src.notifications import telegram as telegram_notifier
-            from src.notifications.telegram import escape_markdown_v2
-            
-            # Açık pozisyonları al
-            open_positions = self.executor.get_open_positions_from_binance()
-            
-            message = f"*🚨 KRİTİK RİSK UYARISI 🚨*\n\n"
-            message += f"*DEVRE KESİCİ AKTİF\\!*\n\n"
-            message += f"*{escape_markdown_v2('-')} Toplam Zarar:* {escape_markdown_v2(f'{pnl_percent:.2f}%')}\n"
-            message += f"*{escape_markdown_v2('-')} Limit:* {escape_markdown_v2(f'{self.max_drawdown_percent}%')}\n"
-            message += f"*{escape_markdown_v2('-')} Mevcut Bakiye:* {escape_markdown_v2(f'${current_balance:.2f}')}\n"
-            message += f"*{escape_markdown_v2('-')} Açık Pozisyon:* {escape_markdown_v2(str(len(open_positions)))}\n\n"
-            message += f"*⛔ SİSTEM DURDURULDU\\!*\n\n"
-            
-            if self.auto_close_on_breaker:
-                message += f"*⚠️ Tüm pozisyonlar otomatik kapatılıyor\\!*"
-            else:
-                message += f"*ℹ️ Lütfen pozisyonları MANUEL kontrol edin\\!*\n\n"
-                message += f"*Öneriler:*\n"
-                message += f"{escape_markdown_v2('1.')} Binance'e giriş yapın\n"
-                message += f"{escape_markdown_v2('2.')} Açık pozisyonları inceleyin\n"
-                message += f"{escape_markdown_v2('3.')} Zarar durdur ayarlarını kontrol edin"
-            
-            telegram_notifier.send_message(message)
-            logger.info("✅ Telegram bildirimi gönderildi")
+            message = _ALERT_TEMPLATES[template_key].format(**fields)
+            self._ensure_alert_worker()
+            self._alert_queue.put_nowait(message)
+            self._last_alert[kind] = time.monotonic()
             
+        except queue.Full:
+            logger.error("❌ Telegram alarm kuyruğu dolu, %s bildirimi düşürüldü", template_key)
         except Exception as e:
-            logger.error(f"❌ Telegram bildirimi gönderilemedi: {e}", exc_info=True)
+            logger.error(f"❌ Telegram bildirimi hazırlanamadı: {e}", exc_info=True)
+    
+    def _send_circuit_breaker_alert(self, current_balance: float, pnl_percent: float, n_positions: int):
+        """Devre kesici Telegram bildirimi."""
+        if not self._alert_due("breaker"):
+            return
+        self._send_alert(
+            "breaker",
+            "breaker_auto" if self.auto_close_on_breaker else "breaker_manual",
+            pnl_pct=escape_markdown_v2(f'{pnl_percent:.2f}%'),
+            limit=self._esc_max_drawdown,
+            balance=escape_markdown_v2(f'${current_balance:.2f}'),
+            n_positions=n_positions,
+        )
     
     def _send_profit_target_alert(self, current_balance: float, pnl: float, pnl_percent: float):
         """Kâr hedefi Telegram bildirimi."""
-        try:
-            from src.notifications import telegram as telegram_notifier
-            from src.notifications.telegram import escape_markdown_v2
-            
-            message = f"*🎯 KÂR HEDEFİNE ULAŞILDI 🎯*\n\n"
-            message += f"*{escape_markdown_v2('-')} Kâr:* {escape_markdown_v2(f'${pnl:.2f}')} \\({escape_markdown_v2(f'{pnl_percent:+.2f}%')}\\)\n"
-            message += f"*{escape_markdown_v2('-')} Hedef:* {escape_markdown_v2(f'{self.profit_target_percent}%')}\n"
-            message += f"*{escape_markdown_v2('-')} Mevcut Bakiye:* {escape_markdown_v2(f'${current_balance:.2f}')}\n\n"
-            
-            if self.auto_transfer_profit:
-                message += f"*💸 Kâr otomatik olarak Spot cüzdana aktarılıyor\\!*"
-            else:
-                message += f"*ℹ️ Kârı manuel çekmek için:*\n"
-                message += f"{escape_markdown_v2('1.')} Binance {escape_markdown_v2('>')} Wallet\n"
-                message += f"{escape_markdown_v2('2.')} Transfer {escape_markdown_v2('>')} Futures to Spot\n"
-                message += f"{escape_markdown_v2('3.')} Miktar: {escape_markdown_v2(f'${pnl:.2f}')}"
-            
-            telegram_notifier.send_message(message)
-            logger.info("✅ Telegram bildirimi gönderildi")
-            
-        except Exception as e:
-            logger.error(f"❌ Telegram bildirimi gönderilemedi: {e}", exc_info=True)
+        if not self._alert_due("profit"):
+            return
+        self._send_alert(
+            "profit",
+            "profit_auto" if self.auto_transfer_profit else "profit_manual",
+            pnl=escape_markdown_v2(f'${pnl:.2f}'),
+            pnl_pct=escape_markdown_v2(f'{pnl_percent:+.2f}%'),
+            target=self._esc_profit_target,
+            balance=escape_markdown_v2(f'${current_balance:.2f}'),
+        )
     
-    def _emergency_close_all_positions(self):
+    def _emergency_close_all_positions(self, positions: Optional[List[Dict]] = None):
         """
         ACİL DURUM: Tüm açık pozisyonları piyasa fiyatından kapatır.
         ⚠️ TEHLİKELİ - Sadece kritik durumlarda kullanılır!
@@ -196,27 +441,35 @@ class CapitalManager:
         logger.warning("⚠️ ACİL KAPATMA BAŞLADI...")
         
         try:
-            positions = self.executor.get_open_positions_from_binance()
+            if positions is None:
+                positions = self._get_open_positions()
+            
+            # positionAmt tek geçişte parse edilir; sıfır olanlar baştan elenir
+            targets = [(p['symbol'], amt) for p in positions or ()
+                       if (amt := float(p['positionAmt'])) != 0.0]
             
-            if not positions:
+            if not targets:
                 logger.info("ℹ️ Kapatılacak açık pozisyon yok")
                 return
             
-            for pos in positions:
-                symbol = pos['symbol']
-                position_amt = float(pos['positionAmt'])
-                
-                if position_amt == 0:
-                    continue
-                
-                try:
+            # Tüm kapatma emirleri paralel gönderilir (N pozisyon ≈ 1 RTT)
+            with ThreadPoolExecutor(max_workers=min(len(targets), _MAX_CLOSE_WORKERS),
+                                    thread_name_prefix="EmergencyClose") as pool:
+                futures = {}
+                for symbol, position_amt in targets:
                     logger.warning(f"⚠️ {symbol} kapatılıyor (Miktar: {position_amt})...")
-                    # NOT: close_position_market fonksiyonu henüz yazılmadı
-                    # Adım 3'te eklenecek
-                    logger.warning(f"⚠️ {symbol} kapatma kodu henüz implement edilmedi!")
-                    
-                except Exception as e:
-                    logger.error(f"❌ {symbol} kapatılamadı: {e}", exc_info=True)
+                    # quantity=None: emir anındaki tüm pozisyon kapatılır
+                    futures[pool.submit(self.executor.close_position_market, symbol)] = symbol
+                
+                for future, symbol in futures.items():
+                    try:
+                        if future.result() is None:
+                            logger.error(f"❌ {symbol} kapatılamadı (executor None döndürdü)")
+                    except Exception as e:
+                        logger.error(f"❌ {symbol} kapatılamadı: {e}", exc_info=True)
+            
+            # Pozisyon/bakiye değişti; cache'deki eski değerler kullanılmamalı
+            self._invalidate_cache()
             
         except Exception as e:
             logger.error(f"❌ Acil kapatma hatası: {e}", exc_info=True)
@@ -248,7 +501,8 @@ def initialize_capital_manager(config_module, executor, stop_event: Event) -> Ca
         CapitalManager instance
     """
     logger.info("🏦 Capital Manager başlatılıyor...")
-    return CapitalManager(config_module, executor, stop_event)
+    settings = CapitalConfig.from_module(config_module)
+    return CapitalManager(config_module, executor, stop_event, settings)
 
 
 # --- Test Bloğu ---
@@ -287,6 +541,7 @@ if __name__ == '__main__':
         # Test kontrolü
         print("\n🔍 Sermaye kontrolü yapılıyor...\n")
         capital_mgr.check_capital()
+        capital_mgr.wait_alerts()
         
         print("\n" + "=" * 60)
         print("✅ TEST TAMAMLANDI!")
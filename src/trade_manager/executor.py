@@ -5,21 +5,147 @@ Binance Futures API Executor
 Tüm gerçek emir yürütme işlemlerini yöneten izole modül.
 """
 
+import atexit
 import logging
+import math
 import time
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from collections import OrderedDict
+from threading import Event, Lock
+from typing import Any, Callable, Hashable, Optional, Dict, List, Tuple
 from decimal import Decimal, ROUND_DOWN, ROUND_UP
 
 logger = logging.getLogger(__name__)
 
+# REST bağlantı havuzu: paralel emir/okuma thread'leri (acil kapatma, prepare_symbol vb.)
+# aynı keep-alive TLS bağlantılarını yeniden kullanır
+_HTTP_POOL_SIZE = 32
+
+# Aynı okuma zaten sürüyorsa bekleme üst sınırı (sonra çağıran kendisi çeker)
+_SINGLE_FLIGHT_TIMEOUT_SECONDS = 5.0
+
+# Exchange info (lot/tick size vb.) nadiren değişir; tüm semboller tek çağrıda cache'lenir
+_SYMBOL_INFO_TTL_SECONDS = 3600
+_SYMBOL_INFO_MISS_REFRESH_SECONDS = 60  # Cache'te olmayan sembol için en sık yenileme aralığı
+
+# Float yuvarlama: step bu kadar ondalıktan inceyse Decimal yoluna düşülür
+_FLOAT_ROUND_MAX_DECIMALS = 12
+
+# Kaldıraç / margin tipi cache'i: Binance UI'dan değiştirilebildiği için süre sınırlı güvenilir
+_SYMBOL_SETTINGS_TTL_SECONDS = 300
+# Bu hatalar kaldıraç/margin/pozisyon durumunun cache'tekinden farklı olabileceğini gösterir
+_SYMBOL_SETTINGS_ERROR_CODES = frozenset({-2019, -2022, -2027, -2028, -4028, -4047, -4048, -4061})
+
+# futures_account snapshot'ı (bakiye + pozisyonlar) bu süre boyunca tekrar kullanılır
+_ACCOUNT_SNAPSHOT_TTL_SECONDS = 2.0
+
+# User-data stream: market emir dolumunun WebSocket'ten bekleneceği süre (sonra REST'e düşülür)
+_ORDER_FILL_WAIT_SECONDS = 2.0
+_FINAL_ORDER_STATUSES = frozenset({'FILLED', 'CANCELED', 'EXPIRED', 'EXPIRED_IN_MATCH', 'REJECTED'})
+_MAX_TRACKED_FILLS = 256  # Kimsenin beklemediği dolumlar (SL/TP vb.) için üst sınır
+
+# Mark price: WebSocket (!markPrice@arr@1s) veya REST'ten gelen fiyat bu süre geçerli sayılır
+_MARK_PRICE_TTL_SECONDS = 2.0
+
 # --- Binance Client Import ---
 try:
     from binance.client import Client
     from binance.exceptions import BinanceAPIException, BinanceRequestException
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
 except ImportError:
     logger.critical("❌ python-binance kütüphanesi bulunamadı! pip install python-binance")
     raise
 
+try:
+    from binance import ThreadedWebsocketManager
+except ImportError:
+    ThreadedWebsocketManager = None
+
+# Opsiyonel: orjson varsa REST yanıtları C tabanlı parser ile çözülür
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolInfo:
+    """
+    Sembol kuralları (lot/tick size vb.).
+    step/tick Decimal'leri bir kez oluşturulur; yuvarlama fonksiyonları her çağrıda
+    Decimal(str(...)) dönüşümü yapmaz. Eski dict kullanımı için ['key'] / .get() desteklenir.
+    """
+    symbol: str
+    status: str
+    price_precision: int
+    quantity_precision: int
+    min_qty: float
+    max_qty: float
+    step_size: float
+    min_notional: float
+    tick_size: float
+    step_size_dec: Decimal
+    tick_size_dec: Decimal
+    step_decimals: int
+    tick_decimals: int
+    price_fmt: str  # "%.{price_precision}f"
+    
+    def floor_price(self, price: float) -> float:
+        """Fiyatı tick_size'ın katına aşağı yuvarlar (Binance kuralı)."""
+        return _floor_to_step(price, self.tick_size, self.tick_decimals, self.tick_size_dec)
+    
+    def format_price(self, price: float) -> str:
+        """Fiyatı tick_size'a aşağı yuvarlayıp price_precision hassasiyetinde string'e çevirir."""
+        return self.price_fmt % self.floor_price(price)
+    
+    def __getitem__(self, key: str) -> Any:
+        return getattr(self, key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """requests yanıtının .json() metodunu orjson ile değiştirir (python-binance bunu çağırır)."""
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
+
+@dataclass(slots=True)
+class _Flight:
+    """Devam eden tek bir okuma; bekleyenler aynı sonucu paylaşır."""
+    done: Event
+    result: Any = None
+    error: Optional[BaseException] = None
+
+
+@dataclass(frozen=True, slots=True)
+class AccountSnapshot:
+    """Tek futures_account çağrısından elde edilen bakiye + açık pozisyonlar."""
+    timestamp: float
+    total_balance: float
+    positions: Tuple[Dict, ...]  # Sadece positionAmt != 0 olanlar (ham Binance dict'leri)
+
+
+def _floor_to_step(value: float, step: float, decimals: int, step_dec: Decimal) -> float:
+    """
+    value'yu step'in katına aşağı yuvarlar (float aritmetiği).
+    Negatif değer veya çok ince step'te eski Decimal yolu kullanılır.
+    """
+    if value < 0 or decimals > _FLOAT_ROUND_MAX_DECIMALS:
+        rounded = (Decimal(str(value)) // step_dec) * step_dec
+        return float(rounded.quantize(step_dec, rounding=ROUND_DOWN))
+    
+    n = math.floor(value / step)
+    # FP kalıntısı (örn. 0.3 / 0.1 = 2.9999999999999996) n'i bir kaydırabilir; sonuç value ile doğrulanır
+    if round((n + 1) * step, decimals) <= value:
+        n += 1
+    elif round(n * step, decimals) > value:
+        n -= 1
+    return round(n * step, decimals)
+
 
 class BinanceFuturesExecutor:
     """
@@ -50,6 +176,44 @@ class BinanceFuturesExecutor:
         self.testnet = testnet
         self.client: Optional[Client] = None
         
+        # Sembol bilgisi cache'i: {symbol: info}, tüm semboller tek futures_exchange_info ile dolar
+        self._symbol_info_cache: Dict[str, SymbolInfo] = {}
+        self._symbol_info_ts: float = 0.0
+        self._symbol_info_miss_ts: float = 0.0
+        self._symbol_info_lock = Lock()
+        
+        # Single-flight: {key: _Flight}; aynı anda gelen özdeş okumalar tek REST çağrısına iner
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._inflight_lock = Lock()
+        
+        # Sembol başına doğrulanmış kaldıraç / margin tipi: {symbol: (değer, timestamp)}
+        # (_SYMBOL_SETTINGS_TTL_SECONDS içinde zaten ayarlıysa REST çağrısı atlanır)
+        self._leverage_cache: Dict[str, Tuple[int, float]] = {}
+        self._margin_cache: Dict[str, Tuple[str, float]] = {}
+        
+        # Hesap snapshot'ı (futures_account): bakiye + pozisyonlar tek çağrıda
+        self._snapshot: Optional[AccountSnapshot] = None
+        self._snapshot_lock = Lock()
+        # Her invalidate'te artar; daha eski nesilde başlamış fetch'in sonucu cache'e yazılmaz
+        self._snapshot_gen = 0
+        
+        # WebSocket stream'leri (opsiyonel, tek ThreadedWebsocketManager)
+        self._twm = None
+        self._user_stream_active = False
+        self._streams_atexit_registered = False
+        
+        # Mark price cache'i: {symbol: (timestamp, price)}; stream açıksa her saniye güncellenir
+        self._mark_prices: Dict[str, Tuple[float, float]] = {}
+        # Açıksa mark price stream'i ilk cache miss'te başlatılır (kullanılmıyorsa socket açılmaz)
+        self._mark_price_stream_on_demand = False
+        self._mark_price_stream_requested = False
+        self._mark_price_stream_lock = Lock()
+        
+        # User-data stream: orderId -> dolum bilgisi / bekleyen Event
+        self._fill_lock = Lock()
+        self._order_fills: "OrderedDict[int, Dict]" = OrderedDict()
+        self._fill_waiters: Dict[int, Event] = {}
+        
         self._initialize_client()
         self._initialized = True
     
@@ -70,8 +234,18 @@ class BinanceFuturesExecutor:
                     api_secret=self.api_secret
                 )
             
+            session = getattr(self.client, 'session', None)
+            if session is not None:
+                self._configure_session(session)
+            
+            # exchange_info / account gibi büyük yanıtlar için hızlı JSON parse
+            if orjson is not None and session is not None:
+                session.hooks['response'].append(_orjson_response_hook)
+                logger.debug("orjson aktif: Binance REST yanıtları orjson ile parse ediliyor")
+            
             # Bağlantıyı test et
             account_info = self.client.futures_account()
+            self._store_snapshot(account_info)
             logger.info(f"✅ Binance Futures bağlantısı başarılı. Bakiye: {account_info['totalWalletBalance']} USDT")
             
         except BinanceAPIException as e:
@@ -81,18 +255,291 @@ class BinanceFuturesExecutor:
             logger.critical(f"❌ Executor başlatılamadı: {e}")
             raise
     
+    @staticmethod
+    def _configure_session(session):
+        """
+        Client'ın requests session'ına büyük keep-alive havuzu bağlar.
+        Retry sadece bağlantı kurulamadığında devreye girer (emir POST'ları tekrar gönderilmez).
+        """
+        adapter = HTTPAdapter(
+            pool_connections=_HTTP_POOL_SIZE,
+            pool_maxsize=_HTTP_POOL_SIZE,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.1),
+        )
+        session.mount('https://', adapter)
+    
+    # ==================== WEBSOCKET STREAM'LERİ ====================
+    
+    def _ensure_twm(self):
+        """Paylaşılan ThreadedWebsocketManager'ı (gerekirse) başlatıp döndürür."""
+        if self._twm is None:
+            if ThreadedWebsocketManager is None:
+                raise RuntimeError("ThreadedWebsocketManager bulunamadı")
+            twm = ThreadedWebsocketManager(
+                api_key=self.api_key,
+                api_secret=self.api_secret,
+                testnet=self.testnet
+            )
+            twm.start()
+            self._twm = twm
+            # graceful_shutdown dışındaki çıkışlarda da (örn. mark price stream) WebSocket thread'i kapatılsın
+            if not self._streams_atexit_registered:
+                atexit.register(self.stop_streams)
+                self._streams_atexit_registered = True
+        return self._twm
+    
+    def start_user_stream(self) -> bool:
+        """
+        Futures user-data WebSocket'ini başlatır (ORDER_TRADE_UPDATE).
+        Başlatılamazsa open_market_order eskisi gibi sleep + REST ile çalışır.
+        
+        Returns:
+            bool: Stream başladıysa True
+        """
+        try:
+            self._ensure_twm().start_futures_user_socket(callback=self._handle_user_message)
+            self._user_stream_active = True
+            logger.info("✅ Futures user-data stream başlatıldı (emir dolumları WebSocket'ten izleniyor)")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"⚠️ User-data stream başlatılamadı, REST kullanılacak: {e}")
+            return False
+    
+    def start_mark_price_stream(self) -> bool:
+        """
+        Tüm semboller için mark price stream'ini başlatır (!markPrice@arr@1s).
+        Başlatılamazsa get_mark_price REST ile çalışır.
+        
+        Returns:
+            bool: Stream başladıysa True
+        """
+        try:
+            self._ensure_twm().start_all_mark_price_socket(callback=self._handle_mark_price_message, fast=True)
+            logger.info("✅ Mark price stream başlatıldı (tüm semboller, 1s)")
+            return True
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Mark price stream başlatılamadı, REST kullanılacak: {e}")
+            return False
+    
+    def stop_streams(self):
+        """Tüm WebSocket stream'lerini durdurur."""
+        if self._twm is None:
+            return
+        try:
+            self._twm.stop()
+        except Exception as e:
+            logger.warning(f"⚠️ WebSocket stream'leri durdurulurken hata: {e}")
+        finally:
+            self._twm = None
+            self._user_stream_active = False
+    
+    def _handle_mark_price_message(self, msg):
+        """!markPrice@arr mesajındaki tüm sembollerin mark price'ını cache'e yazar."""
+        data = msg.get('data', msg) if isinstance(msg, dict) else msg
+        if not isinstance(data, list):
+            return
+        
+        now = time.time()
+        for item in data:
+            try:
+                self._mark_prices[item['s']] = (now, float(item['p']))
+            except (KeyError, TypeError, ValueError):
+                continue
+    
+    def get_mark_price(self, symbol: str) -> Optional[float]:
+        """
+        Sembolün mark price'ını döndürür.
+        Önce stream/REST cache'i (_MARK_PRICE_TTL_SECONDS), yoksa futures_mark_price REST çağrısı.
+        EXECUTOR_MARK_PRICE_STREAM_ENABLED açıksa ilk cache miss'te mark price stream'i başlatılır.
+        
+        Returns:
+            float veya None: Mark price (alınamazsa None)
+        """
+        entry = self._mark_prices.get(symbol)
+        if entry is not None and time.time() - entry[0] < _MARK_PRICE_TTL_SECONDS:
+            return entry[1]
+        
+        if self._mark_price_stream_on_demand:
+            with self._mark_price_stream_lock:
+                start = not self._mark_price_stream_requested
+                self._mark_price_stream_requested = True
+            if start:
+                # Bu çağrı REST'ten okur; sonrakiler stream cache'ini kullanır
+                self.start_mark_price_stream()
+        
+        try:
+            mp = self.client.futures_mark_price(symbol=symbol)
+            price = float(mp.get('markPrice', 0))
+        except Exception as e:
+            logger.debug(f"{symbol} mark price alınamadı: {e}")
+            return None
+        
+        if price > 0:
+            self._mark_prices[symbol] = (time.time(), price)
+        return price
+    
+    def _handle_user_message(self, msg: Dict):
+        """ORDER_TRADE_UPDATE mesajlarından sonuçlanmış emirleri kaydeder ve bekleyeni uyandırır."""
+        data = msg.get('data', msg) if isinstance(msg, dict) else None
+        if not data:
+            return
+        
+        if data.get('e') in ('error', 'listenKeyExpired'):
+            # Socket koptu / listen key düştü: sonraki emirler dolum beklemeden REST'e düşsün
+            logger.warning(f"⚠️ User-data stream kapandı, emir dolumları REST ile izlenecek: {data}")
+            self._user_stream_active = False
+            with self._fill_lock:
+                waiters = list(self._fill_waiters.values())
+            for waiter in waiters:
+                waiter.set()
+            return
+        
+        if data.get('e') != 'ORDER_TRADE_UPDATE':
+            return
+        
+        o = data.get('o', {})
+        if o.get('X') not in _FINAL_ORDER_STATUSES:
+            return
+        
+        order_id = int(o['i'])
+        fill = {
+            'status': o['X'],
+            'executedQty': float(o.get('z', 0)),
+            'avgPrice': float(o.get('ap', 0)),
+        }
+        
+        with self._fill_lock:
+            self._order_fills[order_id] = fill
+            while len(self._order_fills) > _MAX_TRACKED_FILLS:
+                self._order_fills.popitem(last=False)
+            waiter = self._fill_waiters.get(order_id)
+        
+        if waiter is not None:
+            waiter.set()
+    
+    def _wait_for_fill(self, order_id: int, timeout: float = _ORDER_FILL_WAIT_SECONDS) -> Optional[Dict]:
+        """
+        Emrin sonucunu user-data stream'den bekler.
+        
+        Returns:
+            Dict veya None: {'status', 'executedQty', 'avgPrice'}; stream yoksa/zaman aşımında None
+        """
+        if not self._user_stream_active:
+            return None
+        
+        with self._fill_lock:
+            # Market emir REST yanıtından önce dolmuş olabilir
+            fill = self._order_fills.pop(order_id, None)
+            if fill is not None:
+                return fill
+            waiter = self._fill_waiters[order_id] = Event()
+        
+        waiter.wait(timeout)
+        
+        with self._fill_lock:
+            self._fill_waiters.pop(order_id, None)
+            fill = self._order_fills.pop(order_id, None)
+        
+        if fill is None:
+            logger.debug(f"User-data stream {order_id} için {timeout}s içinde dolum bildirmedi")
+        return fill
+    
     # ==================== OKUMA FONKSİYONLARI ====================
     
+    def _single_flight(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Aynı key için devam eden bir çağrı varsa onun sonucunu bekler; yoksa fetch'i çalıştırır.
+        Bekleme _SINGLE_FLIGHT_TIMEOUT_SECONDS'ı aşarsa çağıran kendisi fetch eder.
+        """
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight(done=Event())
+        
+        if not leader:
+            if flight.done.wait(_SINGLE_FLIGHT_TIMEOUT_SECONDS):
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+            logger.debug(f"Single-flight beklemesi zaman aşımına uğradı: {key}")
+            return fetch()
+        
+        try:
+            flight.result = fetch()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+    
+    def _store_snapshot(self, account: Dict, generation: Optional[int] = None) -> AccountSnapshot:
+        """
+        futures_account yanıtını AccountSnapshot'a çevirip cache'ler.
+        generation verilmişse ve fetch sonrası invalidate edildiyse (emir gönderildi) sonuç cache'lenmez.
+        """
+        open_positions = []
+        for pos in account.get('positions', []):
+            if float(pos.get('positionAmt', 0)) == 0:
+                continue
+            # positionRisk ile aynı anahtar (eski çağıranlar için)
+            if 'unrealizedProfit' in pos:
+                pos['unRealizedProfit'] = pos['unrealizedProfit']
+            self._remember_symbol_settings(
+                pos['symbol'], pos.get('leverage'),
+                ('isolated' if pos['isolated'] else 'cross') if 'isolated' in pos else None
+            )
+            open_positions.append(pos)
+        
+        snapshot = AccountSnapshot(
+            timestamp=time.time(),
+            total_balance=float(account.get('totalWalletBalance', 0)),
+            positions=tuple(open_positions),
+        )
+        with self._snapshot_lock:
+            if generation is None or generation == self._snapshot_gen:
+                self._snapshot = snapshot
+            else:
+                logger.debug("Account snapshot fetch sırasında geçersiz kılındı, cache'lenmedi")
+        return snapshot
+    
+    def refresh_snapshot(self) -> AccountSnapshot:
+        """futures_account'ı bir kez çağırıp bakiye + tüm açık pozisyonları yeniler."""
+        with self._snapshot_lock:
+            generation = self._snapshot_gen
+        return self._store_snapshot(self.client.futures_account(), generation)
+    
+    def get_account_snapshot(self, max_age: float = _ACCOUNT_SNAPSHOT_TTL_SECONDS) -> AccountSnapshot:
+        """max_age saniyeden yeni snapshot varsa onu, yoksa yenisini döndürür."""
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            generation = self._snapshot_gen
+        if snapshot is not None and time.time() - snapshot.timestamp < max_age:
+            return snapshot
+        # Eşzamanlı miss'lerde (örn. bakiye + pozisyon paralel okunurken) futures_account tek sefer çağrılır;
+        # key'de nesil olduğu için invalidate sonrası gelen okuma emir öncesi başlamış fetch'e bağlanmaz
+        return self._single_flight(('account_snapshot', generation), self.refresh_snapshot)
+    
+    def invalidate_account_snapshot(self):
+        """Emir sonrası bakiye/pozisyonlar değiştiği için snapshot'ı geçersiz kılar."""
+        with self._snapshot_lock:
+            self._snapshot = None
+            self._snapshot_gen += 1
+    
     def get_futures_account_balance(self) -> float:
         """
-        Futures cüzdan bakiyesini (USDT) döndürür.
+        Futures cüzdan bakiyesini (USDT) döndürür (hesap snapshot'ından).
         
         Returns:
             float: Toplam USDT bakiyesi
         """
         try:
-            account = self.client.futures_account()
-            total_balance = float(account.get('totalWalletBalance', 0))
+            total_balance = self.get_account_snapshot().total_balance
             logger.debug(f"Futures Bakiye: {total_balance} USDT")
             return total_balance
             
@@ -106,6 +553,7 @@ class BinanceFuturesExecutor:
     def get_open_positions_from_binance(self, symbol: Optional[str] = None) -> List[Dict]:
         """
         Binance'den gerçek açık pozisyonları çeker.
+        Sembol verilmezse hesap snapshot'ı kullanılır (bakiye ile aynı futures_account çağrısı).
         
         Args:
             symbol: Belirli bir sembol için filtrele (opsiyonel)
@@ -116,6 +564,12 @@ class BinanceFuturesExecutor:
                           'unrealizedProfit': float, 'leverage': int, ...}
         """
         try:
+            if symbol is None:
+                # Snapshot paylaşılıyor; çağıran değiştirebileceği için kopyaları döndür
+                open_positions = [dict(pos) for pos in self.get_account_snapshot().positions]
+                logger.debug(f"Binance'den {len(open_positions)} açık pozisyon alındı (snapshot)")
+                return open_positions
+            
             positions = self.client.futures_position_information(symbol=symbol)
             
             # Sadece açık pozisyonları filtrele (positionAmt != 0)
@@ -124,6 +578,9 @@ class BinanceFuturesExecutor:
                 if float(pos.get('positionAmt', 0)) != 0
             ]
             
+            for pos in open_positions:
+                self._remember_symbol_settings(pos['symbol'], pos.get('leverage'), pos.get('marginType'))
+            
             logger.debug(f"Binance'den {len(open_positions)} açık pozisyon alındı")
             return open_positions
             
@@ -134,9 +591,48 @@ class BinanceFuturesExecutor:
             logger.error(f"❌ Beklenmeyen hata (pozisyonlar): {e}", exc_info=True)
             return []
     
+    def _remember_symbol_settings(self, symbol: str, leverage=None, margin_type: Optional[str] = None):
+        """Binance yanıtındaki kaldıraç/margin tipini cache'e yazar (alan yoksa dokunmaz)."""
+        now = time.time()
+        if leverage:
+            self._leverage_cache[symbol] = (int(leverage), now)
+        if margin_type:
+            # positionRisk 'isolated'/'cross' döner; set_margin_type 'ISOLATED'/'CROSSED' kullanır
+            margin_type = margin_type.upper()
+            self._margin_cache[symbol] = ('CROSSED' if margin_type == 'CROSS' else margin_type, now)
+    
+    @staticmethod
+    def _cached_setting(cache: Dict[str, Tuple[Any, float]], symbol: str) -> Any:
+        """Cache'teki değeri _SYMBOL_SETTINGS_TTL_SECONDS dolmadıysa döndürür, yoksa None."""
+        entry = cache.get(symbol)
+        if entry is not None and time.time() - entry[1] < _SYMBOL_SETTINGS_TTL_SECONDS:
+            return entry[0]
+        return None
+    
+    def invalidate_symbol_settings(self, symbol: str):
+        """Sembolün kaldıraç / margin tipi cache'ini siler (bir sonraki prepare_symbol REST'e gider)."""
+        self._leverage_cache.pop(symbol, None)
+        self._margin_cache.pop(symbol, None)
+    
+    def handle_order_error(self, symbol: str, error: Exception):
+        """
+        futures_create_order hatasına göre cache'leri tazeler.
+        Kaldıraç/margin/pozisyon kaynaklı hatalarda sembol ayarları, geçersiz sembolde exchange info geçersiz kılınır.
+        """
+        code = getattr(error, 'code', None)
+        if code == -1121:
+            self.invalidate_symbol_info()
+            return
+        
+        text = str(error).lower()
+        if code in _SYMBOL_SETTINGS_ERROR_CODES or any(k in text for k in ('leverage', 'margin', 'position')):
+            logger.info(f"ℹ️ {symbol} kaldıraç/margin cache'i emir hatası nedeniyle silindi")
+            self.invalidate_symbol_settings(symbol)
+    
     def get_position_info(self, symbol: str) -> Optional[Dict]:
         """
         Belirli bir sembolün detaylı pozisyon bilgisini çeker.
+        Aynı sembol için eşzamanlı çağrılar tek REST isteğini paylaşır.
         
         Args:
             symbol: İşlem çifti (örn: 'BTCUSDT')
@@ -144,11 +640,16 @@ class BinanceFuturesExecutor:
         Returns:
             Dict veya None: Pozisyon bilgileri
         """
+        return self._single_flight(('position_info', symbol), lambda: self._fetch_position_info(symbol))
+    
+    def _fetch_position_info(self, symbol: str) -> Optional[Dict]:
+        """get_position_info'nun REST kısmı (futures_position_information)."""
         try:
             positions = self.client.futures_position_information(symbol=symbol)
             
             if positions and len(positions) > 0:
                 pos = positions[0]
+                self._remember_symbol_settings(pos['symbol'], pos.get('leverage'), pos.get('marginType'))
                 
                 # Kullanışlı formatta döndür
                 return {
@@ -235,38 +736,83 @@ class BinanceFuturesExecutor:
             logger.error(f"❌ Beklenmeyen hata (açık emirler): {e}", exc_info=True)
             return []
     
-    def get_symbol_info(self, symbol: str) -> Optional[Dict]:
+    @staticmethod
+    def _parse_symbol_info(s: Dict) -> SymbolInfo:
+        """futures_exchange_info içindeki tek sembol kaydını SymbolInfo'ya çevirir."""
+        # Filtreleri parse et
+        filters = {f['filterType']: f for f in s['filters']}
+        step_size = float(filters.get('LOT_SIZE', {}).get('stepSize', 0))
+        tick_size = float(filters.get('PRICE_FILTER', {}).get('tickSize', 0))
+        step_size_dec = Decimal(str(step_size))
+        tick_size_dec = Decimal(str(tick_size))
+        
+        return SymbolInfo(
+            symbol=s['symbol'],
+            status=s['status'],
+            price_precision=int(s['pricePrecision']),
+            quantity_precision=int(s['quantityPrecision']),
+            min_qty=float(filters.get('LOT_SIZE', {}).get('minQty', 0)),
+            max_qty=float(filters.get('LOT_SIZE', {}).get('maxQty', 0)),
+            step_size=step_size,
+            min_notional=float(filters.get('MIN_NOTIONAL', {}).get('notional', 0)),
+            tick_size=tick_size,
+            step_size_dec=step_size_dec,
+            tick_size_dec=tick_size_dec,
+            step_decimals=max(0, -step_size_dec.as_tuple().exponent),
+            tick_decimals=max(0, -tick_size_dec.as_tuple().exponent),
+            price_fmt=f"%.{int(s['pricePrecision'])}f",
+        )
+    
+    def _refresh_symbol_info(self):
+        """futures_exchange_info'yu bir kez çekip TÜM sembollerin bilgisini cache'e yazar."""
+        exchange_info = self.client.futures_exchange_info()
+        parsed = {s['symbol']: self._parse_symbol_info(s) for s in exchange_info['symbols']}
+        
+        with self._symbol_info_lock:
+            self._symbol_info_cache = parsed
+            self._symbol_info_ts = time.time()
+        
+        logger.debug(f"Sembol bilgisi cache'i yenilendi: {len(parsed)} sembol")
+    
+    def invalidate_symbol_info(self):
+        """Sembol bilgisi cache'ini geçersiz kılar (örn. -1121 Invalid symbol sonrası)."""
+        with self._symbol_info_lock:
+            self._symbol_info_ts = 0.0
+    
+    def get_symbol_info(self, symbol: str) -> Optional[SymbolInfo]:
         """
         Sembol bilgilerini çeker (lot size, tick size, vb).
+        Sonuç _SYMBOL_INFO_TTL_SECONDS boyunca cache'ten döner.
         
         Args:
             symbol: İşlem çifti
         
         Returns:
-            Dict veya None: Sembol filtreleri ve kuralları
+            SymbolInfo veya None: Sembol filtreleri ve kuralları
         """
         try:
-            exchange_info = self.client.futures_exchange_info()
-            
-            for s in exchange_info['symbols']:
-                if s['symbol'] == symbol:
-                    # Filtreleri parse et
-                    filters = {f['filterType']: f for f in s['filters']}
-                    
-                    return {
-                        'symbol': symbol,
-                        'status': s['status'],
-                        'price_precision': int(s['pricePrecision']),
-                        'quantity_precision': int(s['quantityPrecision']),
-                        'min_qty': float(filters.get('LOT_SIZE', {}).get('minQty', 0)),
-                        'max_qty': float(filters.get('LOT_SIZE', {}).get('maxQty', 0)),
-                        'step_size': float(filters.get('LOT_SIZE', {}).get('stepSize', 0)),
-                        'min_notional': float(filters.get('MIN_NOTIONAL', {}).get('notional', 0)),
-                        'tick_size': float(filters.get('PRICE_FILTER', {}).get('tickSize', 0))
-                    }
-            
-            logger.warning(f"⚠️ {symbol} sembol bilgisi bulunamadı")
-            return None
+            with self._symbol_info_lock:
+                fresh = time.time() - self._symbol_info_ts < _SYMBOL_INFO_TTL_SECONDS
+            
+            if not fresh:
+                # Eşzamanlı cache miss'lerde exchange info yalnızca bir kez çekilir
+                self._single_flight('symbol_info', self._refresh_symbol_info)
+            
+            info = self._symbol_info_cache.get(symbol)
+            if info is None and fresh:
+                # Açılıştan sonra listelenen semboller için en fazla _SYMBOL_INFO_MISS_REFRESH_SECONDS'ta bir yenile
+                now = time.time()
+                with self._symbol_info_lock:
+                    retry = now - self._symbol_info_miss_ts >= _SYMBOL_INFO_MISS_REFRESH_SECONDS
+                    if retry:
+                        self._symbol_info_miss_ts = now
+                if retry:
+                    self._single_flight('symbol_info', self._refresh_symbol_info)
+                    info = self._symbol_info_cache.get(symbol)
+            
+            if info is None:
+                logger.warning(f"⚠️ {symbol} sembol bilgisi bulunamadı")
+            return info
             
         except BinanceAPIException as e:
             logger.error(f"❌ Sembol bilgisi alınamadı: {e}")
@@ -293,14 +839,9 @@ class BinanceFuturesExecutor:
                 logger.warning(f"⚠️ {symbol} için sembol bilgisi yok, yuvarlanamadı")
                 return quantity
             
-            step_size = Decimal(str(symbol_info['step_size']))
-            quantity_decimal = Decimal(str(quantity))
-            
-            # Step size'a göre yuvarla
-            rounded = (quantity_decimal // step_size) * step_size
-            
-            # Float'a çevir
-            return float(rounded.quantize(step_size, rounding=ROUND_DOWN))
+            # Step size'a göre aşağı yuvarla
+            return _floor_to_step(quantity, symbol_info.step_size, symbol_info.step_decimals,
+                                  symbol_info.step_size_dec)
             
         except Exception as e:
             logger.error(f"❌ Miktar yuvarlama hatası: {e}", exc_info=True)
@@ -324,14 +865,9 @@ class BinanceFuturesExecutor:
                 logger.warning(f"⚠️ {symbol} için sembol bilgisi yok, fiyat yuvarlanamadı")
                 return price
             
-            tick_size = Decimal(str(symbol_info['tick_size']))
-            price_decimal = Decimal(str(price))
-            
-            # Tick size'a göre yuvarla (quantity ile aynı mantık)
-            rounded = (price_decimal // tick_size) * tick_size
-            
-            # Float'a çevir
-            return float(rounded.quantize(tick_size, rounding=ROUND_DOWN))
+            # Tick size'a göre aşağı yuvarla (quantity ile aynı mantık)
+            return _floor_to_step(price, symbol_info.tick_size, symbol_info.tick_decimals,
+                                  symbol_info.tick_size_dec)
             
         except Exception as e:
             logger.error(f"❌ Fiyat yuvarlama hatası: {e}", exc_info=True)
@@ -350,6 +886,10 @@ class BinanceFuturesExecutor:
         Returns:
             bool: Başarılıysa True
         """
+        if self._cached_setting(self._leverage_cache, symbol) == leverage:
+            logger.debug(f"ℹ️ {symbol} kaldıraç zaten {leverage}x (cache)")
+            return True
+        
         try:
             logger.info(f"🔧 {symbol} için kaldıraç ayarlanıyor: {leverage}x")
             
@@ -359,6 +899,8 @@ class BinanceFuturesExecutor:
             )
             
             logger.info(f"✅ {symbol} kaldıraç ayarlama komutu gönderildi: {leverage}x")
+            # Cache'e sadece doğrulanan (Binance'ten okunan) kaldıraç yazılır
+            self._leverage_cache.pop(symbol, None)
             
             # 🆕 BACKEND PROPAGATION: Binance'in leverage'ı uygulaması için bekle
             time.sleep(0.3)  # 300ms wait
@@ -368,6 +910,7 @@ class BinanceFuturesExecutor:
                 position_info = self.client.futures_position_information(symbol=symbol)
                 if position_info and len(position_info) > 0:
                     actual_leverage = int(position_info[0].get('leverage', 0))
+                    self._remember_symbol_settings(symbol, actual_leverage)
                     if actual_leverage == leverage:
                         logger.info(f"   ✅ DOĞRULANDI: {symbol} Binance kaldıraç = {actual_leverage}x")
                     else:
@@ -401,6 +944,10 @@ class BinanceFuturesExecutor:
         Returns:
             bool: Başarılıysa True
         """
+        if self._cached_setting(self._margin_cache, symbol) == margin_type:
+            logger.debug(f"ℹ️ {symbol} margin tipi zaten {margin_type} (cache)")
+            return True
+        
         try:
             logger.info(f"🔧 {symbol} için margin tipi ayarlanıyor: {margin_type}")
             
@@ -410,12 +957,14 @@ class BinanceFuturesExecutor:
             )
             
             logger.info(f"✅ {symbol} margin tipi başarıyla {margin_type} olarak ayarlandı")
+            self._remember_symbol_settings(symbol, margin_type=margin_type)
             return True
             
         except BinanceAPIException as e:
             # Margin tipi zaten ayarlıysa hata döner, bu normal
             if 'No need to change margin type' in str(e):
                 logger.debug(f"ℹ️ {symbol} margin tipi zaten {margin_type}")
+                self._remember_symbol_settings(symbol, margin_type=margin_type)
                 return True
             
             logger.error(f"❌ {symbol} margin tipi ayarlanamadı: {e}")
@@ -425,6 +974,29 @@ class BinanceFuturesExecutor:
             logger.error(f"❌ Beklenmeyen hata (margin tipi): {e}", exc_info=True)
             return False
     
+    def prepare_symbol(self, symbol: str, leverage: int, margin_type: str = 'ISOLATED') -> bool:
+        """
+        Emir öncesi margin tipi ve kaldıracı paralel ayarlar.
+        İki REST çağrısı birbirinden bağımsız; sıralı yerine aynı anda gönderilir (~1 RTT).
+        
+        Args:
+            symbol: İşlem çifti
+            leverage: Kaldıraç değeri
+            margin_type: 'ISOLATED' veya 'CROSSED'
+        
+        Returns:
+            bool: Kaldıraç ayarlandıysa True (margin hatası sadece loglanır)
+        """
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="PrepareSymbol") as pool:
+            margin_future = pool.submit(self.set_margin_type, symbol, margin_type)
+            leverage_future = pool.submit(self.set_leverage, symbol, leverage)
+            margin_ok = margin_future.result()
+            leverage_ok = leverage_future.result()
+        
+        if not margin_ok:
+            logger.warning(f"   ⚠️ {symbol} margin mode ayarlanamadı ({margin_type})")
+        return leverage_ok
+    
     def open_market_order(self, symbol: str, direction: str, quantity_units: float, entry_price: Optional[float] = None, leverage: Optional[int] = None) -> Optional[Dict]:
         """
         Piyasa emri ile pozisyon açar.
@@ -454,11 +1026,7 @@ class BinanceFuturesExecutor:
                 # Fiyat belirle (entry_price yoksa mark price)
                 price = entry_price
                 if price is None:
-                    try:
-                        mp = self.client.futures_mark_price(symbol=symbol)
-                        price = float(mp.get('markPrice', 0))
-                    except Exception:
-                        price = None
+                    price = self.get_mark_price(symbol)
                 if not price or price <= 0:
                     # Son çare: son trade price
                     try:
@@ -488,7 +1056,7 @@ class BinanceFuturesExecutor:
                     required_units = required_notional / price
                     # Step size al ve yukarı yuvarla
                     sym = self.get_symbol_info(symbol)
-                    step = Decimal(str(sym['step_size'])) if sym and sym.get('step_size') else Decimal('0.0001')
+                    step = sym.step_size_dec if sym and sym.step_size else Decimal('0.0001')
                     units_dec = Decimal(str(required_units))
                     n = (units_dec / step).quantize(Decimal('1'), rounding=ROUND_UP)
                     rounded_up_units = float(n * step)
@@ -521,30 +1089,43 @@ class BinanceFuturesExecutor:
             
             order_id = order['orderId']
             logger.info(f"✅ {symbol} pozisyon emri gönderildi: Order ID {order_id}")
+            self.invalidate_account_snapshot()
+            
+            # 🔄 KRİTİK: Market order asenkron dolabilir
+            # User-data stream açıksa dolum WebSocket'ten beklenir (sleep + REST sorgusu yok)
+            streamed = self._user_stream_active
+            fill = self._wait_for_fill(order_id)
+            if fill is not None:
+                executed_qty = fill['executedQty']
+                avg_price = fill['avgPrice']
+                order_status = fill['status']
+                logger.info(f"📊 {symbol} Order Durumu (WebSocket): Status={order_status}, "
+                            f"Executed Qty={executed_qty}, Avg Price={avg_price}")
+            else:
+                # Stream yoksa kısa bekleyip REST ile sorgula; stream zaman aşımında
+                # zaten _ORDER_FILL_WAIT_SECONDS beklendi, doğrudan tek REST sorgusu yapılır
+                if not streamed:
+                    time.sleep(0.5)  # 500ms bekle (market order fill için)
             
-            # 🔄 KRİTİK: Market order asenkron dolabilir, kısa bekleyip tekrar sorgula
-            import time
-            time.sleep(0.5)  # 500ms bekle (market order fill için)
-            
-            # Order bilgisini tekrar sorgula (güncel executedQty için)
-            try:
-                order_info = self.client.futures_get_order(symbol=symbol, orderId=order_id)
-                executed_qty = float(order_info.get('executedQty', 0))
-                avg_price = float(order_info.get('avgPrice', 0))
-                order_status = order_info.get('status', 'UNKNOWN')
+                # Order bilgisini tekrar sorgula (güncel executedQty için)
+                try:
+                    order_info = self.client.futures_get_order(symbol=symbol, orderId=order_id)
+                    executed_qty = float(order_info.get('executedQty', 0))
+                    avg_price = float(order_info.get('avgPrice', 0))
+                    order_status = order_info.get('status', 'UNKNOWN')
                 
-                logger.info(f"📊 {symbol} Order Durumu (500ms sonra):")
-                logger.info(f"   Order ID: {order_id}")
-                logger.info(f"   Status: {order_status}")
-                logger.info(f"   Side: {side}")
-                logger.info(f"   Requested Qty: {rounded_qty}")
-                logger.info(f"   Executed Qty: {executed_qty}")
-                logger.info(f"   Avg Price: {avg_price}")
-            except Exception as e:
-                logger.warning(f"⚠️ Order bilgisi sorgulanamadı, ilk yanıtı kullanıyorum: {e}")
-                executed_qty = float(order.get('executedQty', 0))
-                avg_price = float(order.get('avgPrice', 0))
-                order_status = order.get('status', 'UNKNOWN')
+                    logger.info(f"📊 {symbol} Order Durumu (REST):")
+                    logger.info(f"   Order ID: {order_id}")
+                    logger.info(f"   Status: {order_status}")
+                    logger.info(f"   Side: {side}")
+                    logger.info(f"   Requested Qty: {rounded_qty}")
+                    logger.info(f"   Executed Qty: {executed_qty}")
+                    logger.info(f"   Avg Price: {avg_price}")
+                except Exception as e:
+                    logger.warning(f"⚠️ Order bilgisi sorgulanamadı, ilk yanıtı kullanıyorum: {e}")
+                    executed_qty = float(order.get('executedQty', 0))
+                    avg_price = float(order.get('avgPrice', 0))
+                    order_status = order.get('status', 'UNKNOWN')
             
             # 🚨 EXECUTED QTY = 0 KONTROLÜ
             if executed_qty <= 0:
@@ -591,6 +1172,9 @@ class BinanceFuturesExecutor:
         except BinanceAPIException as e:
             logger.error(f"❌ {symbol} pozisyon açılamadı (API Hatası): {e}")
             
+            # Geçersiz sembol / kaldıraç-margin uyumsuzluğu: ilgili cache'leri tazele
+            self.handle_order_error(symbol, e)
+            
             # Hata nedenlerini detaylıca logla
             if 'Insufficient balance' in str(e) or '-2019' in str(e):
                 logger.error(f"   NEDEN: Yetersiz bakiye!")
@@ -645,24 +1229,15 @@ class BinanceFuturesExecutor:
             # FİYATLARI YUVARLA
             symbol_info = self.get_symbol_info(symbol)
             if symbol_info:
-                # ✅ DÜZELTME: Tick size ile düzgün yuvarlama (Decimal kullan)
-                tick_size = Decimal(str(symbol_info.get('tick_size', 0.00001)))
                 sl_price_original = sl_price
                 tp_price_original = tp_price
                 
-                # Tick size'a göre yuvarla (ROUND_DOWN kullan - Binance kuralı)
-                sl_decimal = Decimal(str(sl_price))
-                tp_decimal = Decimal(str(tp_price))
-                
-                sl_rounded = (sl_decimal / tick_size).quantize(Decimal('1'), rounding=ROUND_DOWN) * tick_size
-                tp_rounded = (tp_decimal / tick_size).quantize(Decimal('1'), rounding=ROUND_DOWN) * tick_size
-                
-                # Float'a çevir (API için gerekli)
-                sl_price = float(sl_rounded)
-                tp_price = float(tp_rounded)
+                # Tick size'a göre aşağı yuvarla (Binance kuralı)
+                sl_price = symbol_info.floor_price(sl_price)
+                tp_price = symbol_info.floor_price(tp_price)
                 
                 # ⚠️ KRİTİK: Yuvarlama sonrası entry fiyatına çok yakınsa, 1 tick uzaklaştır
-                tick_size_float = float(tick_size)
+                tick_size_float = symbol_info.tick_size
                 
                 if direction.upper() == 'LONG':
                     # LONG: SL giriş altında, TP giriş üstünde olmalı
@@ -688,16 +1263,11 @@ class BinanceFuturesExecutor:
             
             logger.info(f"🎯 {symbol} için SL/TP emirleri yerleştiriliyor...")
             
-            # 🆕 KRİTİK: Fiyatları tick size'a göre yuvarla
-            rounded_sl_price = self.round_price(symbol, sl_price)
-            rounded_tp_price = self.round_price(symbol, tp_price)
+            # 🆕 KRİTİK: Fiyatları tick size'a yuvarlayıp sembol hassasiyetinde string'e çevir
+            sl_price_str = symbol_info.format_price(sl_price)
+            tp_price_str = symbol_info.format_price(tp_price)
             
-            # Fiyatları format string ile düzgün hassasiyette gönder
-            price_precision = symbol_info.get('price_precision', 8)
-            sl_price_str = f"{rounded_sl_price:.{price_precision}f}"
-            tp_price_str = f"{rounded_tp_price:.{price_precision}f}"
-            
-            logger.info(f"   📏 SL={sl_price_str}, TP={tp_price_str} (precision={price_precision})")
+            logger.info(f"   📏 SL={sl_price_str}, TP={tp_price_str} (precision={symbol_info.price_precision})")
             
             # 1. STOP LOSS emri
             sl_order = self.client.futures_create_order(
@@ -832,6 +1402,7 @@ class BinanceFuturesExecutor:
                 quantity=close_qty,
                 reduceOnly=True
             )
+            self.invalidate_account_snapshot()
             
             logger.info(f"✅ {symbol} pozisyon KAPATILDI:")
             logger.info(f"   Order ID: {order['orderId']}")
@@ -912,6 +1483,12 @@ def initialize_executor(config_module) -> BinanceFuturesExecutor:
     logger.info("🔧 Binance Futures Executor başlatılıyor...")
     _executor_instance = BinanceFuturesExecutor(api_key, api_secret, testnet)
     
+    if getattr(config_module, 'EXECUTOR_USER_STREAM_ENABLED', False):
+        _executor_instance.start_user_stream()
+    if getattr(config_module, 'EXECUTOR_MARK_PRICE_STREAM_ENABLED', False):
+        # Tüm semboller stream'i sadece get_mark_price ilk kez REST'e düştüğünde açılır
+        _executor_instance._mark_price_stream_on_demand = True
+    
     return _executor_instance
 
 
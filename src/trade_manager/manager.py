@@ -1106,6 +1106,7 @@ def close_position(position_id: int, exit_price: float, reason: str):
                     quantity=position.position_size_units,
                     reduceOnly=True  # Sadece mevcut pozisyonu kapat
                 )
+                executor.invalidate_account_snapshot()
                 
                 # Gerçek kapanış fiyatını al
                 if 'avgPrice' in close_order and close_order['avgPrice']:
@@ -1241,20 +1242,9 @@ def place_real_order(signal_data):
         margin_type = 'ISOLATED'  # Isolated mode (güvenlik)
         
         try:
-            # Kaldıraç ayarla
+            # Kaldıraç + margin mode (ISOLATED) paralel ayarlanır
             logger.info(f"🔧 {symbol} kaldıraç ayarlanıyor: {leverage}x ({margin_type})")
-            executor.set_leverage(symbol, leverage)
-            
-            # Margin mode ayarla (ISOLATED)
-            try:
-                executor.client.futures_change_margin_type(symbol=symbol, marginType=margin_type)
-                logger.info(f"   ✅ Margin mode: {margin_type}")
-            except Exception as margin_error:
-                # Eğer zaten ISOLATED ise hata verir, önemli değil
-                if 'No need to change margin type' in str(margin_error):
-                    logger.debug(f"   ℹ️ Margin mode zaten {margin_type}")
-                else:
-                    logger.warning(f"   ⚠️ Margin mode ayarlanamadı: {margin_error}")
+            executor.prepare_symbol(symbol, leverage, margin_type)
         except Exception as leverage_error:
             logger.error(f"❌ Kaldıraç ayarlanamadı: {leverage_error}")
             logger.error(f"   Pozisyon açılmayacak - güvenlik riski!")
@@ -1268,13 +1258,20 @@ def place_real_order(signal_data):
         logger.info(f"   ✅ Precision uygulandı: Qty={quantity}, TP=${tp_price}, SL=${sl_price}")
 
         # 1. Market emri ile pozisyon aç (entry_price yerine MARKET kullan, Futures'ta daha hızlı)
-        entry_order = executor.client.futures_create_order(
-            symbol=symbol,
-            side=side,
-            type='MARKET',
-            quantity=quantity
-        )
+        try:
+            entry_order = executor.client.futures_create_order(
+                symbol=symbol,
+                side=side,
+                type='MARKET',
+                quantity=quantity
+            )
+        except BinanceAPIException as entry_error:
+            # Kaldıraç/margin cache'i Binance ile uyuşmuyor olabilir; sonraki prepare_symbol REST'e gitsin
+            executor.handle_order_error(symbol, entry_error)
+            raise
         
+        # Pozisyonlar değişti: eski account snapshot'ı sync_positions_with_binance'e ulaşmasın
+        executor.invalidate_account_snapshot()
         logger.info(f"✅ Entry emri FILLED: OrderID={entry_order['orderId']}")
         
         # 2. Take Profit emri (Limit, reduceOnly)